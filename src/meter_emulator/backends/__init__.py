@@ -1,16 +1,21 @@
+import importlib
+
 from meter_emulator.backends.base import Backend
-from meter_emulator.backends.envoy import EnvoyBackend
 
-_BACKENDS: dict[str, type[Backend]] = {
-    "envoy": EnvoyBackend,
+# Backend classes as "module:class" paths, imported on first use so that only
+# the selected backend's dependencies (httpx, pyenphase, ...) get loaded.
+_BACKENDS: dict[str, str] = {
+    "envoy": "meter_emulator.backends.envoy:EnvoyBackend",
 }
 
 
 def create_backend(backend_type: str, config: dict) -> Backend:
     """Create a backend instance by type name."""
-    cls = _BACKENDS.get(backend_type)
-    if cls is None:
+    path = _BACKENDS.get(backend_type)
+    if path is None:
         raise ValueError(
             f"Unknown backend type: {backend_type!r}. Available: {', '.join(_BACKENDS)}"
         )
+    module_name, class_name = path.split(":")
+    cls: type[Backend] = getattr(importlib.import_module(module_name), class_name)
     return cls(config)
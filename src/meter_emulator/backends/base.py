@@ -1,8 +1,8 @@
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PhaseData:
     """Electrical measurements for a single phase."""
 
@@ -16,11 +16,16 @@ class PhaseData:
     total_act_ret_energy: float = 0.0  # Cumulative export energy (Wh)
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MeterData:
-    """Normalized meter data produced by backends, consumed by frontends."""
+    """Normalized meter data produced by backends, consumed by frontends.
 
-    phases: list[PhaseData] = field(default_factory=lambda: [PhaseData()])
+    Instances are immutable snapshots (``phases`` is a tuple of frozen PhaseData):
+    backends publish an update by swapping in a new instance, so readers always
+    see one consistent reading.
+    """
+
+    phases: tuple[PhaseData, ...] = (PhaseData(),)
     total_act_power: float = 0.0
     total_aprt_power: float = 0.0
     total_current: float = 0.0
@@ -46,4 +51,9 @@ class Backend(ABC):
 
     @abstractmethod
     def get_meter_data(self) -> MeterData:
-        """Return the latest meter data snapshot."""
+        """Return the latest meter data snapshot.
+
+        Frontends may hold on to the returned object (e.g. while serializing or
+        between push notifications), so backends must publish each update as a
+        new snapshot rather than mutating a previously returned one.
+        """
@@ -1,26 +1,43 @@
 import asyncio
 import logging
 import time
+from collections.abc import Callable
 from typing import Any
 
 import httpx
+import orjson
 
 from meter_emulator.backends.base import Backend, MeterData, PhaseData
 
 logger = logging.getLogger(__name__)
 
+# Clock for the poll schedule; a module attribute so tests can drive it without
+# patching time.monotonic for the whole event loop
+_monotonic = time.monotonic
 
-def _find_measurement(
-    production: list[dict[str, Any]], measurement_type: str
-) -> dict[str, Any] | None:
-    """Find a measurement block by type in the Envoy production array."""
-    for entry in production:
-        if (
-            entry.get("measurementType") == measurement_type
-            or entry.get("type") == measurement_type
-        ):
-            return entry
-    return None
+
+def _find_measurements(
+    entries: list[dict[str, Any]], *measurement_types: str
+) -> list[dict[str, Any] | None]:
+    """Find the first block of each measurement type in a single pass.
+
+    A block matches a type when either its ``measurementType`` or its ``type``
+    equals it. The scan stops as soon as every requested type has been found.
+    """
+    found: dict[str, dict[str, Any]] = {}
+    for entry in entries:
+        for key in (entry.get("measurementType"), entry.get("type")):
+            if key in measurement_types and key not in found:
+                found[key] = entry
+        if len(found) == len(measurement_types):
+            break
+    return [found.get(t) for t in measurement_types]
+
+
+# Returned whenever the response has no consumption data. Snapshots are fully
+# immutable (frozen, with a tuple of frozen phases), so one shared instance can
+# serve every such poll without risk of corruption (and keeps frontend caches warm).
+_NO_DATA = MeterData()
 
 
 def parse_envoy_response(data: dict[str, Any], phases: int) -> MeterData:
@@ -30,77 +47,132 @@ def parse_envoy_response(data: dict[str, Any], phases: int) -> MeterData:
         data: Parsed JSON from /production.json?details=1
         phases: Number of phases to map (1 or 3)
     """
-    production_list = data.get("production", [])
-    consumption_list = data.get("consumption", [])
+    return _get_parser(phases)(data)
 
-    # Find the measurement blocks we need
-    net_consumption = _find_measurement(consumption_list, "total-consumption")
-    # Try "net-consumption" first — that's the grid meter reading
-    net_meter = _find_measurement(consumption_list, "net-consumption")
-    production_inverters = _find_measurement(production_list, "inverters")
 
-    # Use net-consumption if available, else fall back to total-consumption
-    grid = net_meter or net_consumption
+def _find_grid(data: dict[str, Any]) -> tuple[dict[str, Any] | None, ...] | None:
+    """Find the measurement blocks needed to build MeterData.
 
+    Returns (grid, production inverters, net-consumption, total-consumption), or
+    None when the response has no consumption data at all.
+    """
+    (production_inverters,) = _find_measurements(data.get("production", []), "inverters")
+    # "net-consumption" is the grid meter reading; "total-consumption" is the fallback
+    net_meter, net_consumption = _find_measurements(
+        data.get("consumption", []), "net-consumption", "total-consumption"
+    )
+    grid = net_meter or net_consumption
     if grid is None:
         logger.warning("No consumption data found in Envoy response")
-        return MeterData()
-
-    if phases == 1:
+        return None
+    return grid, production_inverters, net_meter, net_consumption
+
+
+def _parse_single(data: dict[str, Any]) -> MeterData:
+    """Map the grid meter totals onto a single phase."""
+    found = _find_grid(data)
+    if found is None:
+        return _NO_DATA
+    grid, production_inverters, net_meter, net_consumption = found
+
+    # Totals equal the single phase's values
+    act_power = grid.get("wNow", 0.0)
+    aprt_power = grid.get("apprntPwr", 0.0)
+    current = grid.get("rmsCurrent", 0.0)
+    act_energy = grid.get("whLifetime", 0.0)
+    ret_energy = _calc_ret_energy(production_inverters, net_consumption, net_meter)
+    phase = PhaseData(
+        voltage=grid.get("rmsVoltage", 0.0),
+        current=current,
+        act_power=act_power,
+        aprt_power=aprt_power,
+        pf=grid.get("pwrFactor", 0.0),
+        freq=50.0,
+        total_act_energy=act_energy,
+        total_act_ret_energy=ret_energy,
+    )
+    return MeterData(
+        phases=(phase,),
+        total_act_power=act_power,
+        total_aprt_power=aprt_power,
+        total_current=current,
+        total_act_energy=act_energy,
+        total_act_ret_energy=ret_energy,
+    )
+
+
+def _three_lines(block: dict[str, Any] | None) -> tuple[dict[str, Any], ...]:
+    """Return a block's first three "lines", zero-filling missing ones with {}."""
+    lines = block.get("lines", []) if block else []
+    return (*lines, {}, {}, {})[:3]
+
+
+def _parse_three(data: dict[str, Any]) -> MeterData:
+    """Map the per-line data from the Envoy "lines" arrays onto three phases."""
+    found = _find_grid(data)
+    if found is None:
+        return _NO_DATA
+    grid, production_inverters, net_meter, net_consumption = found
+
+    phase_data_list: list[PhaseData] = []
+    for line, prod_line, cons_line, net_line in zip(
+        _three_lines(grid),
+        _three_lines(production_inverters),
+        _three_lines(net_consumption),
+        _three_lines(net_meter),
+    ):
+        get = line.get
+        # Return energy: production - total consumption + net consumption
+        ret_energy = max(
+            0.0,
+            prod_line.get("whLifetime", 0.0)
+            - cons_line.get("whLifetime", 0.0)
+            + net_line.get("whLifetime", 0.0),
+        )
         phase = PhaseData(
-            voltage=grid.get("rmsVoltage", 0.0),
-            current=grid.get("rmsCurrent", 0.0),
-            act_power=grid.get("wNow", 0.0),
-            aprt_power=grid.get("apprntPwr", 0.0),
-            pf=grid.get("pwrFactor", 0.0),
+            voltage=get("rmsVoltage", 0.0),
+            current=get("rmsCurrent", 0.0),
+            act_power=get("wNow", 0.0),
+            aprt_power=get("apprntPwr", 0.0),
+            pf=get("pwrFactor", 0.0),
             freq=50.0,
-            total_act_energy=grid.get("whLifetime", 0.0),
-            total_act_ret_energy=_calc_ret_energy(production_inverters, net_consumption, net_meter),
-        )
-        return MeterData(
-            phases=[phase],
-            total_act_power=phase.act_power,
-            total_aprt_power=phase.aprt_power,
-            total_current=phase.current,
-            total_act_energy=phase.total_act_energy,
-            total_act_ret_energy=phase.total_act_ret_energy,
-        )
-    else:
-        # 3-phase: map per-line data from Envoy "lines" array
-        lines = grid.get("lines", [])
-        prod_lines = production_inverters.get("lines", []) if production_inverters else []
-        cons_lines = net_consumption.get("lines", []) if net_consumption else []
-        net_lines = net_meter.get("lines", []) if net_meter else []
-
-        phase_data_list: list[PhaseData] = []
-        for i in range(3):
-            line = lines[i] if i < len(lines) else {}
-            phase = PhaseData(
-                voltage=line.get("rmsVoltage", 0.0),
-                current=line.get("rmsCurrent", 0.0),
-                act_power=line.get("wNow", 0.0),
-                aprt_power=line.get("apprntPwr", 0.0),
-                pf=line.get("pwrFactor", 0.0),
-                freq=50.0,
-                total_act_energy=line.get("whLifetime", 0.0),
-                total_act_ret_energy=_calc_ret_energy_line(prod_lines, cons_lines, net_lines, i),
-            )
-            phase_data_list.append(phase)
-
-        total_power = sum(p.act_power for p in phase_data_list)
-        total_aprt = sum(p.aprt_power for p in phase_data_list)
-        total_curr = sum(p.current for p in phase_data_list)
-        total_energy = sum(p.total_act_energy for p in phase_data_list)
-        total_ret = sum(p.total_act_ret_energy for p in phase_data_list)
-
-        return MeterData(
-            phases=phase_data_list,
-            total_act_power=total_power,
-            total_aprt_power=total_aprt,
-            total_current=total_curr,
-            total_act_energy=total_energy,
-            total_act_ret_energy=total_ret,
+            total_act_energy=get("whLifetime", 0.0),
+            total_act_ret_energy=ret_energy,
         )
+        phase_data_list.append(phase)
+
+    # Accumulate all totals in a single pass over the phases
+    total_power = total_aprt = total_curr = total_energy = total_ret = 0.0
+    for p in phase_data_list:
+        total_power += p.act_power
+        total_aprt += p.aprt_power
+        total_curr += p.current
+        total_energy += p.total_act_energy
+        total_ret += p.total_act_ret_energy
+
+    return MeterData(
+        phases=tuple(phase_data_list),
+        total_act_power=total_power,
+        total_aprt_power=total_aprt,
+        total_current=total_curr,
+        total_act_energy=total_energy,
+        total_act_ret_energy=total_ret,
+    )
+
+
+# Phase count -> parser, resolved once per backend instead of branching per poll
+_PARSERS: dict[int, Callable[[dict[str, Any]], MeterData]] = {
+    1: _parse_single,
+    3: _parse_three,
+}
+
+
+def _get_parser(phases: int) -> Callable[[dict[str, Any]], MeterData]:
+    """Return the parser for the given phase count."""
+    try:
+        return _PARSERS[phases]
+    except KeyError:
+        raise ValueError(f"phases must be 1 or 3, got {phases!r}") from None
 
 
 def _calc_ret_energy(
@@ -118,23 +190,21 @@ def _calc_ret_energy(
     return max(0.0, prod_wh - cons_wh + net_wh)
 
 
-def _calc_ret_energy_line(
-    prod_lines: list[dict],
-    cons_lines: list[dict],
-    net_lines: list[dict],
-    index: int,
-) -> float:
-    """Calculate return energy for a specific phase line."""
-    prod_wh = prod_lines[index].get("whLifetime", 0.0) if index < len(prod_lines) else 0.0
-    cons_wh = cons_lines[index].get("whLifetime", 0.0) if index < len(cons_lines) else 0.0
-    net_wh = net_lines[index].get("whLifetime", 0.0) if index < len(net_lines) else 0.0
-    return max(0.0, prod_wh - cons_wh + net_wh)
-
-
 # Refresh token if it expires within 30 days (same threshold as HA integration)
 _TOKEN_REFRESH_THRESHOLD_SECONDS = 30 * 24 * 3600
-# Check token expiry once per day
+# Minimum spacing between scheduled token checks (also the retry delay when the
+# token can't be obtained or refreshed)
 _TOKEN_CHECK_INTERVAL_SECONDS = 24 * 3600
+# Longest single sleep before re-checking against the wall clock, which may jump
+# after the delay was computed (NTP sync on RTC-less hosts, suspend/resume)
+_TOKEN_CHECK_MAX_DELAY_SECONDS = 7 * _TOKEN_CHECK_INTERVAL_SECONDS
+# Envoy endpoint polled for meter readings (relative to the client's base URL)
+_PRODUCTION_PATH = "/production.json?details=1"
+# Resync the poll schedule when running more than this many intervals late
+_MAX_POLL_LAG_INTERVALS = 2
+# Keep the idle Envoy connection open well beyond any sensible poll interval so
+# each poll reuses it instead of paying a new TCP + TLS handshake
+_KEEPALIVE_EXPIRY_SECONDS = 300.0
 
 
 class EnvoyBackend(Backend):
@@ -146,10 +216,14 @@ class EnvoyBackend(Backend):
         self._poll_interval = config.get("poll_interval", 2.0)
         self._verify_ssl = config.get("verify_ssl", False)
         self._phases = config.get("phases", 1)
+        self._parse = _get_parser(self._phases)
         self._username: str | None = config.get("username")
         self._password: str | None = config.get("password")
         self._serial: str | None = config.get("serial")
+        # Credentials never change at runtime, so resolve this once
+        self._has_credentials = bool(self._username and self._password and self._serial)
         self._data = MeterData()
+        self._last_body: bytes | None = None  # Raw body behind self._data
         self._poll_task: asyncio.Task | None = None
         self._refresh_task: asyncio.Task | None = None
         self._client: httpx.AsyncClient | None = None
@@ -160,9 +234,11 @@ class EnvoyBackend(Backend):
     def poll_interval(self) -> float:
         return self._poll_interval
 
-    @property
-    def _has_credentials(self) -> bool:
-        return all([self._username, self._password, self._serial])
+    def _set_token(self, token: str | None) -> None:
+        """Store a new token and update the client's Authorization header."""
+        self._token = token
+        if self._client is not None and token:
+            self._client.headers["Authorization"] = f"Bearer {token}"
 
     async def _init_token_auth(self) -> None:
         """Initialize pyenphase token auth and obtain/refresh the token."""
@@ -184,7 +260,7 @@ class EnvoyBackend(Backend):
                 connector=connector, timeout=aiohttp.ClientTimeout(total=30)
             )
         await asyncio.wait_for(self._token_auth.setup(self._aiohttp_session), timeout=30)
-        self._token = self._token_auth.token
+        self._set_token(self._token_auth.token)
         logger.info(
             "Token obtained via Enlighten (type=%s, expires=%s)",
             self._token_auth.token_type,
@@ -197,14 +273,26 @@ class EnvoyBackend(Backend):
             await self._init_token_auth()
             return
         await self._token_auth.refresh()
-        self._token = self._token_auth.token
+        self._set_token(self._token_auth.token)
         logger.info(
             "Token refreshed (expires=%s)",
             time.strftime("%Y-%m-%d %H:%M", time.localtime(self._token_auth.expire_timestamp)),
         )
 
     async def start(self) -> None:
-        self._client = httpx.AsyncClient(verify=self._verify_ssl)
+        # Only one request is ever in flight, to a single host: one pooled
+        # keep-alive connection is all we need.
+        self._client = httpx.AsyncClient(
+            base_url=f"https://{self._host}",
+            verify=self._verify_ssl,
+            limits=httpx.Limits(
+                max_connections=1,
+                max_keepalive_connections=1,
+                keepalive_expiry=_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+        # Sent with every poll; _set_token() keeps it current across refreshes
+        self._set_token(self._token)
 
         if self._has_credentials:
             try:
@@ -241,10 +329,24 @@ class EnvoyBackend(Backend):
     def get_meter_data(self) -> MeterData:
         return self._data
 
+    def _next_token_check_delay(self) -> float:
+        """Seconds until the token enters the refresh window.
+
+        Never less than _TOKEN_CHECK_INTERVAL_SECONDS, so short-lived tokens or
+        repeated refresh failures don't turn the check into a busy loop, and never
+        more than _TOKEN_CHECK_MAX_DELAY_SECONDS, so wall-clock jumps get corrected.
+        """
+        if self._token_auth is None:
+            return _TOKEN_CHECK_INTERVAL_SECONDS
+        refresh_at = self._token_auth.expire_timestamp - _TOKEN_REFRESH_THRESHOLD_SECONDS
+        delay = max(refresh_at - time.time(), _TOKEN_CHECK_INTERVAL_SECONDS)
+        return min(delay, _TOKEN_CHECK_MAX_DELAY_SECONDS)
+
     async def _token_check_loop(self) -> None:
-        """Periodically check token expiry and refresh if needed."""
+        """Refresh the token when it gets close to expiry."""
         while True:
-            await asyncio.sleep(_TOKEN_CHECK_INTERVAL_SECONDS)
+            # Sleep towards the refresh window (at most a week) instead of waking daily
+            await asyncio.sleep(self._next_token_check_delay())
             try:
                 if self._token_auth is not None:
                     remaining = self._token_auth.expire_timestamp - time.time()
@@ -260,35 +362,47 @@ class EnvoyBackend(Backend):
                 logger.exception("Scheduled token refresh failed")
 
     async def _poll_loop(self) -> None:
-        url = f"https://{self._host}/production.json?details=1"
+        # Poll on a fixed cadence: sleep until the next deadline rather than a full
+        # interval after each request, so request latency doesn't stretch the period.
+        deadline = _monotonic()
 
         while True:
             try:
                 if not self._token:
                     logger.warning("No token available, skipping poll")
-                    await asyncio.sleep(self._poll_interval)
-                    continue
-
-                assert self._client is not None
-                headers = {"Authorization": f"Bearer {self._token}"}
-                resp = await self._client.get(url, headers=headers, timeout=10.0)
-
-                if resp.status_code == 401 and self._has_credentials:
-                    logger.warning("Got 401 from Envoy, refreshing token")
-                    try:
-                        await self._refresh_token()
-                        headers = {"Authorization": f"Bearer {self._token}"}
-                        resp = await self._client.get(url, headers=headers, timeout=10.0)
-                    except Exception:
-                        logger.exception("Token refresh after 401 failed")
-
-                resp.raise_for_status()
-                data = resp.json()
-                self._data = parse_envoy_response(data, self._phases)
-                logger.debug("Envoy poll OK: total_power=%.1f W", self._data.total_act_power)
+                else:
+                    assert self._client is not None
+                    resp = await self._client.get(_PRODUCTION_PATH, timeout=10.0)
+
+                    if resp.status_code == 401 and self._has_credentials:
+                        logger.warning("Got 401 from Envoy, refreshing token")
+                        try:
+                            await self._refresh_token()
+                            resp = await self._client.get(_PRODUCTION_PATH, timeout=10.0)
+                        except Exception:
+                            logger.exception("Token refresh after 401 failed")
+
+                    resp.raise_for_status()
+                    body = resp.content
+                    if body == self._last_body:
+                        # Envoy hasn't taken a new reading since the last poll
+                        logger.debug("Envoy poll OK: unchanged")
+                    else:
+                        data = orjson.loads(body)
+                        self._data = self._parse(data)
+                        self._last_body = body
+                        logger.debug(
+                            "Envoy poll OK: total_power=%.1f W", self._data.total_act_power
+                        )
             except asyncio.CancelledError:
                 raise
             except Exception:
                 logger.exception("Envoy poll failed")
 
-            await asyncio.sleep(self._poll_interval)
+            deadline += self._poll_interval
+            now = _monotonic()
+            if now - deadline > _MAX_POLL_LAG_INTERVALS * self._poll_interval:
+                # Fell too far behind (slow Envoy, suspended host): resync instead
+                # of firing a burst of back-to-back catch-up polls.
+                deadline = now + self._poll_interval
+            await asyncio.sleep(max(0.0, deadline - now))
@@ -1,14 +1,26 @@
 import os
 import re
-import uuid
 from pathlib import Path
 
 import yaml
 from pydantic import BaseModel, Field, field_validator
 
+try:
+    # libyaml-backed loader, much faster than the pure-Python one
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as _YamlLoader  # type: ignore[assignment]
+
+_ENV_VAR_RE = re.compile(r"\$\{([^}]+)\}")
+_MAC_RE = re.compile(r"[0-9A-F]{12}")
+# Separators accepted (and stripped) in configured MAC addresses
+_MAC_SEPARATORS = str.maketrans("", "", ":-")
+
 
 def _substitute_env_vars(value: str) -> str:
     """Replace ${ENV_VAR} patterns with environment variable values."""
+    if "${" not in value:
+        return value
 
     def replacer(match: re.Match) -> str:
         var_name = match.group(1)
@@ -17,23 +29,41 @@ def _substitute_env_vars(value: str) -> str:
             raise ValueError(f"Environment variable {var_name!r} is not set")
         return env_val
 
-    return re.sub(r"\$\{([^}]+)}", replacer, value)
+    return _ENV_VAR_RE.sub(replacer, value)
 
 
 def _walk_and_substitute(obj: object) -> object:
-    """Recursively substitute env vars in all string values."""
+    """Recursively substitute env vars in all string values.
+
+    Containers are only copied when one of their values actually changed, so
+    subtrees without any ${ENV_VAR} reference are returned as-is.
+    """
     if isinstance(obj, str):
         return _substitute_env_vars(obj)
     if isinstance(obj, dict):
-        return {k: _walk_and_substitute(v) for k, v in obj.items()}
+        new_dict: dict | None = None
+        for k, v in obj.items():
+            new_v = _walk_and_substitute(v)
+            if new_v is not v:
+                if new_dict is None:
+                    new_dict = dict(obj)
+                new_dict[k] = new_v
+        return obj if new_dict is None else new_dict
     if isinstance(obj, list):
-        return [_walk_and_substitute(item) for item in obj]
+        new_list: list | None = None
+        for i, item in enumerate(obj):
+            new_item = _walk_and_substitute(item)
+            if new_item is not item:
+                if new_list is None:
+                    new_list = list(obj)
+                new_list[i] = new_item
+        return obj if new_list is None else new_list
     return obj
 
 
 def _generate_mac() -> str:
-    """Generate a deterministic-looking MAC from a random UUID."""
-    return uuid.uuid4().hex[:12].upper()
+    """Generate a random MAC (12 uppercase hex characters)."""
+    return os.urandom(6).hex().upper()
 
 
 class ServerConfig(BaseModel):
@@ -56,8 +86,8 @@ class ShellyFrontendConfig(BaseModel):
     @field_validator("mac")
     @classmethod
     def validate_mac(cls, v: str) -> str:
-        v = v.upper().replace(":", "").replace("-", "")
-        if len(v) != 12 or not all(c in "0123456789ABCDEF" for c in v):
+        v = v.upper().translate(_MAC_SEPARATORS)
+        if not _MAC_RE.fullmatch(v):
             raise ValueError("mac must be 12 hex characters")
         return v
 
@@ -103,7 +133,7 @@ def load_config(path: str | Path) -> AppConfig:
     """Load and validate configuration from a YAML file."""
     path = Path(path)
     with path.open() as f:
-        raw = yaml.safe_load(f)
+        raw = yaml.load(f, Loader=_YamlLoader)
 
     if raw is None:
         raw = {}
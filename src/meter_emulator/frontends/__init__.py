@@ -1,19 +1,24 @@
 """Frontend registry and factory."""
 
+import importlib
+
 from meter_emulator.backends.base import Backend
 from meter_emulator.frontends.base import Frontend
-from meter_emulator.frontends.shelly import ShellyFrontend
 
-_FRONTENDS: dict[str, type[Frontend]] = {
-    "shelly": ShellyFrontend,
+# Frontend classes as "module:class" paths, imported on first use so that only
+# the selected frontend's dependencies (zeroconf, ...) get loaded.
+_FRONTENDS: dict[str, str] = {
+    "shelly": "meter_emulator.frontends.shelly:ShellyFrontend",
 }
 
 
 def create_frontend(frontend_type: str, backend: Backend, config: dict) -> Frontend:
     """Create a frontend instance by type name."""
-    cls = _FRONTENDS.get(frontend_type)
-    if cls is None:
+    path = _FRONTENDS.get(frontend_type)
+    if path is None:
         raise ValueError(
             f"Unknown frontend type: {frontend_type!r}. Available: {', '.join(_FRONTENDS)}"
         )
+    module_name, class_name = path.split(":")
+    cls: type[Frontend] = getattr(importlib.import_module(module_name), class_name)
     return cls(backend, config)
@@ -1,15 +1,19 @@
 """Shelly Pro 3EM frontend — HTTP API, response models, and mDNS advertisement."""
 
 import asyncio
+import hashlib
 import logging
 import socket
+from collections.abc import Callable
 from typing import Any
 
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+import orjson
+from fastapi import APIRouter, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse
 from zeroconf import ServiceInfo
 from zeroconf.asyncio import AsyncZeroconf
 
-from meter_emulator.backends.base import Backend, MeterData
+from meter_emulator.backends.base import Backend, MeterData, PhaseData
 from meter_emulator.frontends.base import Frontend
 
 logger = logging.getLogger(__name__)
@@ -22,6 +26,11 @@ SHELLY_APP = "Pro3EM"
 SHELLY_FW_VER = "1.6.1-g8dbd358"
 SHELLY_FW_ID = "20250508-110717/1.6.1-g8dbd358"
 
+# Shelly.GetComponents result (pre-serialized): the emulator exposes no dynamic components
+_COMPONENTS_RESPONSE = orjson.Fragment(
+    orjson.dumps({"components": [], "cfg_rev": 0, "offset": 0, "total": 0})
+)
+
 
 # ── Response builders ────────────────────────────────────────────────
 
@@ -31,9 +40,14 @@ def _profile(phases: int) -> str:
     return "triphase" if phases == 3 else "monophase"
 
 
+def _device_id(mac: str) -> str:
+    """Return the Shelly device id (hostname) for the given MAC."""
+    return f"shellypro3em-{mac.lower()}"
+
+
 def device_info(mac: str, phases: int = 3) -> dict[str, Any]:
     """Build Shelly device info response."""
-    device_id = f"shellypro3em-{mac.lower()}"
+    device_id = _device_id(mac)
     return {
         "name": "Shelly Pro 3EM Emulator",
         "id": device_id,
@@ -50,61 +64,107 @@ def device_info(mac: str, phases: int = 3) -> dict[str, Any]:
     }
 
 
-def _phase_key(index: int) -> str:
-    """Return phase letter for index: 0->a, 1->b, 2->c."""
-    return chr(ord("a") + index)
+# Stand-in for phases the backend doesn't report: a 3EM always reports a, b and c
+_NO_PHASE = PhaseData(freq=0.0)
 
 
-def em_get_status(data: MeterData) -> dict[str, Any]:
-    """Build EM.GetStatus response (real-time power)."""
-    result: dict[str, Any] = {"id": 0}
-
-    for i, phase in enumerate(data.phases):
-        key = _phase_key(i)
-        result[f"{key}_current"] = round(phase.current, 3)
-        result[f"{key}_voltage"] = round(phase.voltage, 1)
-        result[f"{key}_act_power"] = round(phase.act_power, 1)
-        result[f"{key}_aprt_power"] = round(phase.aprt_power, 1)
-        result[f"{key}_pf"] = round(phase.pf, 2)
-        result[f"{key}_freq"] = round(phase.freq, 1)
-
-    # Fill missing phases with zeros for a proper 3EM response
-    for i in range(len(data.phases), 3):
-        key = _phase_key(i)
-        result[f"{key}_current"] = 0.0
-        result[f"{key}_voltage"] = 0.0
-        result[f"{key}_act_power"] = 0.0
-        result[f"{key}_aprt_power"] = 0.0
-        result[f"{key}_pf"] = 0.0
-        result[f"{key}_freq"] = 0.0
-
-    result["n_current"] = 0.0
-    result["total_current"] = round(data.total_current, 3)
-    result["total_act_power"] = round(data.total_act_power, 1)
-    result["total_aprt_power"] = round(data.total_aprt_power, 1)
-    result["user_calibrated_phase"] = []
-
-    return result
+def _pad_phases(data: MeterData) -> tuple[PhaseData, PhaseData, PhaseData]:
+    """Return phases a, b, c, zero-filling the ones the backend doesn't report."""
+    a, b, c = (*data.phases, _NO_PHASE, _NO_PHASE, _NO_PHASE)[:3]
+    return a, b, c
 
 
-def emdata_get_status(data: MeterData) -> dict[str, Any]:
-    """Build EMData.GetStatus response (cumulative energy)."""
-    result: dict[str, Any] = {"id": 0}
+def em_get_status(data: MeterData) -> dict[str, Any]:
+    """Build EM.GetStatus response (real-time power)."""
+    if len(data.phases) == 1:
+        return _em_get_status_single(data)
+    a, b, c = _pad_phases(data)
+    return {
+        "id": 0,
+        "a_current": round(a.current, 3),
+        "a_voltage": round(a.voltage, 1),
+        "a_act_power": round(a.act_power, 1),
+        "a_aprt_power": round(a.aprt_power, 1),
+        "a_pf": round(a.pf, 2),
+        "a_freq": round(a.freq, 1),
+        "b_current": round(b.current, 3),
+        "b_voltage": round(b.voltage, 1),
+        "b_act_power": round(b.act_power, 1),
+        "b_aprt_power": round(b.aprt_power, 1),
+        "b_pf": round(b.pf, 2),
+        "b_freq": round(b.freq, 1),
+        "c_current": round(c.current, 3),
+        "c_voltage": round(c.voltage, 1),
+        "c_act_power": round(c.act_power, 1),
+        "c_aprt_power": round(c.aprt_power, 1),
+        "c_pf": round(c.pf, 2),
+        "c_freq": round(c.freq, 1),
+        "n_current": 0.0,
+        "total_current": round(data.total_current, 3),
+        "total_act_power": round(data.total_act_power, 1),
+        "total_aprt_power": round(data.total_aprt_power, 1),
+        "user_calibrated_phase": [],
+    }
 
-    for i, phase in enumerate(data.phases):
-        key = _phase_key(i)
-        result[f"{key}_total_act_energy"] = round(phase.total_act_energy, 2)
-        result[f"{key}_total_act_ret_energy"] = round(phase.total_act_ret_energy, 2)
 
-    for i in range(len(data.phases), 3):
-        key = _phase_key(i)
-        result[f"{key}_total_act_energy"] = 0.0
-        result[f"{key}_total_act_ret_energy"] = 0.0
+def _em_get_status_single(data: MeterData) -> dict[str, Any]:
+    """EM.GetStatus specialized for single-phase data: phases b and c are constant zeros."""
+    a = data.phases[0]
+    return {
+        "id": 0,
+        "a_current": round(a.current, 3),
+        "a_voltage": round(a.voltage, 1),
+        "a_act_power": round(a.act_power, 1),
+        "a_aprt_power": round(a.aprt_power, 1),
+        "a_pf": round(a.pf, 2),
+        "a_freq": round(a.freq, 1),
+        "b_current": 0.0,
+        "b_voltage": 0.0,
+        "b_act_power": 0.0,
+        "b_aprt_power": 0.0,
+        "b_pf": 0.0,
+        "b_freq": 0.0,
+        "c_current": 0.0,
+        "c_voltage": 0.0,
+        "c_act_power": 0.0,
+        "c_aprt_power": 0.0,
+        "c_pf": 0.0,
+        "c_freq": 0.0,
+        "n_current": 0.0,
+        "total_current": round(data.total_current, 3),
+        "total_act_power": round(data.total_act_power, 1),
+        "total_aprt_power": round(data.total_aprt_power, 1),
+        "user_calibrated_phase": [],
+    }
 
-    result["total_act"] = round(data.total_act_energy, 2)
-    result["total_act_ret"] = round(data.total_act_ret_energy, 2)
 
-    return result
+def emdata_get_status(data: MeterData) -> dict[str, Any]:
+    """Build EMData.GetStatus response (cumulative energy)."""
+    if len(data.phases) == 1:
+        a = data.phases[0]
+        return {
+            "id": 0,
+            "a_total_act_energy": round(a.total_act_energy, 2),
+            "a_total_act_ret_energy": round(a.total_act_ret_energy, 2),
+            "b_total_act_energy": 0.0,
+            "b_total_act_ret_energy": 0.0,
+            "c_total_act_energy": 0.0,
+            "c_total_act_ret_energy": 0.0,
+            "total_act": round(data.total_act_energy, 2),
+            "total_act_ret": round(data.total_act_ret_energy, 2),
+        }
+    a, b, c = _pad_phases(data)
+    return {
+        "id": 0,
+        "a_total_act_energy": round(a.total_act_energy, 2),
+        "a_total_act_ret_energy": round(a.total_act_ret_energy, 2),
+        "b_total_act_energy": round(b.total_act_energy, 2),
+        "b_total_act_ret_energy": round(b.total_act_ret_energy, 2),
+        "c_total_act_energy": round(c.total_act_energy, 2),
+        "c_total_act_ret_energy": round(c.total_act_ret_energy, 2),
+        "total_act": round(data.total_act_energy, 2),
+        "total_act_ret": round(data.total_act_ret_energy, 2),
+    }
 
 
 def shelly_get_config(mac: str, phases: int = 3) -> dict[str, Any]:
@@ -134,42 +194,72 @@ def shelly_get_config(mac: str, phases: int = 3) -> dict[str, Any]:
     }
 
 
-def shelly_get_status(data: MeterData, mac: str) -> dict[str, Any]:
-    """Build Shelly.GetStatus response (full device status)."""
+def _sys_status(mac: str) -> dict[str, Any]:
+    """Build the "sys" component status (static for a given MAC)."""
     return {
-        "sys": {
-            "mac": mac,
-            "restart_required": False,
-            "available_updates": {},
-        },
-        "em:0": em_get_status(data),
-        "emdata:0": emdata_get_status(data),
+        "mac": mac,
+        "restart_required": False,
+        "available_updates": {},
     }
 
 
+def _shelly_status(
+    sys_status: dict[str, Any] | orjson.Fragment, em: dict[str, Any], emdata: dict[str, Any]
+) -> dict[str, Any]:
+    """Assemble Shelly.GetStatus from already-built component statuses."""
+    return {"sys": sys_status, "em:0": em, "emdata:0": emdata}
+
+
+async def _ws_send_json(ws: WebSocket, payload: dict[str, Any]) -> None:
+    """Send a JSON text frame serialized with orjson (Shelly clients expect text)."""
+    await ws.send_text(orjson.dumps(payload).decode())
+
+
+async def _ws_receive_json(ws: WebSocket) -> Any:
+    """Receive a JSON frame (text or binary) and decode it with orjson."""
+    message = await ws.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    data = message.get("text")
+    return orjson.loads(data if data is not None else message["bytes"])
+
+
 # ── mDNS advertiser ─────────────────────────────────────────────────
 
 
+def _local_ip() -> str:
+    """Return the IPv4 address of the interface holding the default route.
+
+    Connecting a UDP socket only selects a route; no packet is sent. Without a
+    default route, fall back to resolving the hostname.
+    """
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        s.connect(("8.8.8.8", 80))
+        return s.getsockname()[0]
+    except OSError:
+        logger.warning("mDNS: no default route, resolving local IP from hostname")
+        return socket.getaddrinfo(socket.gethostname(), None, family=socket.AF_INET)[0][4][0]
+    finally:
+        s.close()
+
+
 class _MdnsAdvertiser:
     """Advertises the emulator as a Shelly device via mDNS."""
 
-    def __init__(self, mac: str, port: int) -> None:
+    def __init__(self, mac: str, device_id: str, port: int) -> None:
         self._mac = mac
+        self._device_id = device_id
         self._port = port
         self._aiozc: AsyncZeroconf | None = None
         self._services: list[ServiceInfo] = []
 
     async def start(self) -> None:
-        device_id = f"shellypro3em-{self._mac.lower()}"
+        device_id = self._device_id
         hostname = socket.gethostname()
 
-        # Resolve local IP
-        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-        try:
-            s.connect(("8.8.8.8", 80))
-            local_ip = s.getsockname()[0]
-        finally:
-            s.close()
+        # getaddrinfo may block on DNS: keep it off the event loop
+        local_ip = await asyncio.to_thread(_local_ip)
 
         properties = {
             "id": device_id,
@@ -193,15 +283,19 @@ class _MdnsAdvertiser:
 
         logger.info("mDNS: creating AsyncZeroconf...")
         self._aiozc = AsyncZeroconf()
-        for svc in self._services:
-            logger.info("mDNS: registering %s...", svc.type)
-            await asyncio.wait_for(self._aiozc.async_register_service(svc), timeout=10)
+        # Each registration probes the network for name conflicts: run them together
+        logger.info("mDNS: registering %s...", ", ".join(svc.type for svc in self._services))
+        await asyncio.wait_for(
+            asyncio.gather(*(self._aiozc.async_register_service(svc) for svc in self._services)),
+            timeout=10,
+        )
         logger.info("mDNS: registered %s at %s:%d", device_id, local_ip, self._port)
 
     async def stop(self) -> None:
         if self._aiozc and self._services:
-            for svc in self._services:
-                await self._aiozc.async_unregister_service(svc)
+            await asyncio.gather(
+                *(self._aiozc.async_unregister_service(svc) for svc in self._services)
+            )
             await self._aiozc.async_close()
             logger.info("mDNS: unregistered services")
 
@@ -215,8 +309,6 @@ def _generate_mac() -> str:
     Using the hostname ensures the same MAC across restarts, avoiding
     orphaned mDNS entries from previously random MACs.
     """
-    import hashlib
-
     return hashlib.md5(socket.gethostname().encode()).hexdigest()[:12].upper()
 
 
@@ -229,6 +321,28 @@ class ShellyFrontend(Frontend):
         self._phases: int = config.get("phases", 1)
         self._mdns_enabled: bool = config.get("mdns", True)
         self._port: int = config.get("port", 80)
+        self._device_id = _device_id(self._mac)
+        # Device info and config never change for a given MAC: serialize them once.
+        # WebSocket RPC results embed them verbatim as Fragments; device info is
+        # also served over HTTP as the raw body.
+        self._device_info_bytes = orjson.dumps(device_info(self._mac, self._phases))
+        self._device_info = orjson.Fragment(self._device_info_bytes)
+        self._config = orjson.Fragment(orjson.dumps(shelly_get_config(self._mac, self._phases)))
+        # Pre-serialized "sys" status, embedded as-is in every Shelly.GetStatus
+        self._sys_status = orjson.Fragment(orjson.dumps(_sys_status(self._mac)))
+        # EM/EMData statuses built from the last snapshot seen (see _current_status)
+        self._get_meter_data = backend.get_meter_data
+        self._status_data: MeterData | None = None
+        self._status: tuple[dict[str, Any], dict[str, Any]] = ({}, {})
+        # Method dispatch table for JSON-RPC: method name -> result builder
+        self._rpc_methods: dict[str, Callable[[], Any]] = {
+            "Shelly.GetDeviceInfo": lambda: self._device_info,
+            "Shelly.GetStatus": lambda: _shelly_status(self._sys_status, *self._current_status()),
+            "EM.GetStatus": lambda: self._current_status()[0],
+            "EMData.GetStatus": lambda: self._current_status()[1],
+            "Shelly.GetConfig": lambda: self._config,
+            "Shelly.GetComponents": lambda: _COMPONENTS_RESPONSE,
+        }
         self._router = self._build_router()
         self._mdns: _MdnsAdvertiser | None = None
 
@@ -237,7 +351,7 @@ class ShellyFrontend(Frontend):
 
     async def start(self) -> None:
         if self._mdns_enabled:
-            self._mdns = _MdnsAdvertiser(self._mac, self._port)
+            self._mdns = _MdnsAdvertiser(self._mac, self._device_id, self._port)
             await self._mdns.start()
 
     async def stop(self) -> None:
@@ -248,128 +362,150 @@ class ShellyFrontend(Frontend):
     def mac(self) -> str:
         return self._mac
 
+    def _current_status(self) -> tuple[dict[str, Any], dict[str, Any]]:
+        """Return (EM.GetStatus, EMData.GetStatus) for the backend's current snapshot.
+
+        Snapshots are immutable, so both payloads are built once per snapshot and
+        shared by every request and push until the backend publishes a new one
+        (clients typically poll EM, EMData and Shelly.GetStatus back to back).
+        """
+        data = self._get_meter_data()
+        if data is not self._status_data:
+            self._status = (em_get_status(data), emdata_get_status(data))
+            self._status_data = data
+        return self._status
+
     def _build_router(self) -> APIRouter:
-        router = APIRouter()
-        backend = self._backend
-        mac = self._mac
-        phases = self._phases
-
-        @router.get("/shelly")
-        async def shelly_info():
-            """Device info endpoint."""
-            return device_info(mac, phases)
-
-        @router.get("/rpc/Shelly.GetDeviceInfo")
-        async def get_device_info():
-            """RPC device info endpoint."""
-            return device_info(mac, phases)
-
-        @router.get("/rpc/EM.GetStatus")
-        async def em_status(id: int = 0):
-            """Real-time per-phase power data."""
-            data = backend.get_meter_data()
-            return em_get_status(data)
-
-        @router.get("/rpc/EMData.GetStatus")
-        async def emdata_status(id: int = 0):
-            """Cumulative energy totals."""
-            data = backend.get_meter_data()
-            return emdata_get_status(data)
-
-        @router.get("/rpc/Shelly.GetStatus")
-        async def shelly_status():
-            """Full device status."""
-            data = backend.get_meter_data()
-            return shelly_get_status(data, mac)
-
-        # Method dispatch table for JSON-RPC
-        device_id = f"shellypro3em-{mac.lower()}"
-
-        def _handle_rpc_method(method: str, params: dict[str, Any] | None) -> Any:
-            """Dispatch an RPC method and return the result."""
-            data = backend.get_meter_data()
-            if method == "Shelly.GetDeviceInfo":
-                return device_info(mac, phases)
-            if method == "Shelly.GetStatus":
-                return shelly_get_status(data, mac)
-            if method == "EM.GetStatus":
-                return em_get_status(data)
-            if method == "EMData.GetStatus":
-                return emdata_get_status(data)
-            if method == "Shelly.GetConfig":
-                return shelly_get_config(mac, phases)
-            if method == "Shelly.GetComponents":
-                return {"components": [], "cfg_rev": 0, "offset": 0, "total": 0}
-            return None
-
-        @router.websocket("/rpc")
-        async def websocket_rpc(ws: WebSocket):
-            """Shelly Gen2 JSON-RPC 2.0 over WebSocket with push notifications."""
-            await ws.accept()
-            logger.info("WebSocket /rpc: client connected")
-            peer_src: str = ""
-
-            async def _notify_loop() -> None:
-                """Push NotifyStatus at the backend poll interval."""
-                while True:
-                    await asyncio.sleep(backend.poll_interval)
-                    data = backend.get_meter_data()
-                    em = em_get_status(data)
-                    notification = {
+        router = APIRouter(default_response_class=ORJSONResponse)
+        # Bound methods would name the routes after themselves: pass names (and the
+        # device info descriptions) explicitly to keep the OpenAPI schema stable
+        router.add_api_route(
+            "/shelly",
+            self._http_device_info,
+            methods=["GET"],
+            name="shelly_info",
+            description="Device info endpoint.",
+        )
+        router.add_api_route(
+            "/rpc/Shelly.GetDeviceInfo",
+            self._http_device_info,
+            methods=["GET"],
+            name="get_device_info",
+            description="RPC device info endpoint.",
+        )
+        router.add_api_route(
+            "/rpc/EM.GetStatus", self._http_em_status, methods=["GET"], name="em_status"
+        )
+        router.add_api_route(
+            "/rpc/EMData.GetStatus",
+            self._http_emdata_status,
+            methods=["GET"],
+            name="emdata_status",
+        )
+        router.add_api_route(
+            "/rpc/Shelly.GetStatus",
+            self._http_shelly_status,
+            methods=["GET"],
+            name="shelly_status",
+        )
+        router.add_api_websocket_route("/rpc", self._ws_rpc)
+        return router
+
+    # ── HTTP handlers ──
+
+    # Handlers return the response themselves so FastAPI skips response-model
+    # validation and jsonable_encoder: the payloads are already plain JSON types.
+
+    async def _http_device_info(self) -> Response:
+        """Device info endpoint (/shelly and Shelly.GetDeviceInfo)."""
+        return Response(self._device_info_bytes, media_type="application/json")
+
+    async def _http_em_status(self, id: int = 0) -> Response:
+        """Real-time per-phase power data."""
+        em, _ = self._current_status()
+        return ORJSONResponse(em)
+
+    async def _http_emdata_status(self, id: int = 0) -> Response:
+        """Cumulative energy totals."""
+        _, emdata = self._current_status()
+        return ORJSONResponse(emdata)
+
+    async def _http_shelly_status(self) -> Response:
+        """Full device status."""
+        return ORJSONResponse(_shelly_status(self._sys_status, *self._current_status()))
+
+    # ── WebSocket JSON-RPC ──
+
+    def _handle_rpc_method(self, method: str, params: dict[str, Any] | None) -> Any:
+        """Dispatch an RPC method and return the result (None if unknown)."""
+        handler = self._rpc_methods.get(method)
+        return None if handler is None else handler()
+
+    async def _ws_rpc(self, ws: WebSocket) -> None:
+        """Shelly Gen2 JSON-RPC 2.0 over WebSocket with push notifications."""
+        await ws.accept()
+        logger.info("WebSocket /rpc: client connected")
+        device_id = self._device_id
+        peer_src: str = ""
+
+        async def _notify_loop() -> None:
+            """Push NotifyStatus at the backend poll interval."""
+            while True:
+                await asyncio.sleep(self._backend.poll_interval)
+                em, emdata = self._current_status()
+                notification = {
+                    "src": device_id,
+                    "dst": peer_src,
+                    "method": "NotifyStatus",
+                    "params": {
+                        "em:0": em,
+                        "emdata:0": emdata,
+                    },
+                }
+                logger.debug(
+                    "WebSocket push: NotifyStatus total_act_power=%.1f",
+                    em.get("total_act_power", 0.0),
+                )
+                await _ws_send_json(ws, notification)
+
+        notify_task: asyncio.Task | None = None
+        try:
+            while True:
+                msg = await _ws_receive_json(ws)
+                method = msg.get("method", "")
+                params = msg.get("params")
+                msg_id = msg.get("id")
+                src = msg.get("src", "")
+                if src:
+                    peer_src = src
+
+                result = self._handle_rpc_method(method, params)
+                if result is not None:
+                    logger.debug("WebSocket RPC: %s id=%s → ok", method, msg_id)
+                    response = {
+                        "id": msg_id,
+                        "src": device_id,
+                        "dst": src,
+                        "result": result,
+                    }
+                else:
+                    logger.debug("WebSocket RPC: %s id=%s → error(-114)", method, msg_id)
+                    response = {
+                        "id": msg_id,
                         "src": device_id,
-                        "dst": peer_src,
-                        "method": "NotifyStatus",
-                        "params": {
-                            "em:0": em,
-                            "emdata:0": emdata_get_status(data),
+                        "dst": src,
+                        "error": {
+                            "code": -114,
+                            "message": f"Method {method} failed: Method not found!",
                         },
                     }
-                    logger.debug(
-                        "WebSocket push: NotifyStatus total_act_power=%.1f",
-                        em.get("total_act_power", 0.0),
-                    )
-                    await ws.send_json(notification)
-
-            notify_task: asyncio.Task | None = None
-            try:
-                while True:
-                    msg = await ws.receive_json()
-                    method = msg.get("method", "")
-                    params = msg.get("params")
-                    msg_id = msg.get("id")
-                    src = msg.get("src", "")
-                    if src:
-                        peer_src = src
-
-                    result = _handle_rpc_method(method, params)
-                    if result is not None:
-                        logger.info("WebSocket RPC: %s id=%s → ok", method, msg_id)
-                        response = {
-                            "id": msg_id,
-                            "src": device_id,
-                            "dst": src,
-                            "result": result,
-                        }
-                    else:
-                        logger.info("WebSocket RPC: %s id=%s → error(-114)", method, msg_id)
-                        response = {
-                            "id": msg_id,
-                            "src": device_id,
-                            "dst": src,
-                            "error": {
-                                "code": -114,
-                                "message": f"Method {method} failed: Method not found!",
-                            },
-                        }
-                    await ws.send_json(response)
-
-                    # Start push notifications after the first RPC exchange
-                    if notify_task is None:
-                        notify_task = asyncio.create_task(_notify_loop())
-            except WebSocketDisconnect:
-                logger.info("WebSocket /rpc: client disconnected")
-            finally:
-                if notify_task is not None:
-                    notify_task.cancel()
+                await _ws_send_json(ws, response)
 
-        return router
+                # Start push notifications after the first RPC exchange
+                if notify_task is None:
+                    notify_task = asyncio.create_task(_notify_loop())
+        except WebSocketDisconnect:
+            logger.info("WebSocket /rpc: client disconnected")
+        finally:
+            if notify_task is not None:
+                notify_task.cancel()
@@ -6,6 +6,7 @@ from contextlib import asynccontextmanager
 
 import uvicorn
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from meter_emulator.backends import create_backend
 from meter_emulator.config import load_config
@@ -19,7 +20,10 @@ _config_path: str = "/app/config.yaml"
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    config = load_config(_config_path)
+    # run() stores the config it already loaded; the uvicorn CLI (Docker) doesn't
+    config = getattr(app.state, "config", None)
+    if config is None:
+        config = load_config(_config_path)
 
     # Create and start backend
     backend_type = config.backend.type
@@ -57,7 +61,7 @@ async def lifespan(app: FastAPI):
     await backend.stop()
 
 
-app = FastAPI(title="Meter Emulator", lifespan=lifespan)
+app = FastAPI(title="Meter Emulator", lifespan=lifespan, default_response_class=ORJSONResponse)
 
 
 def run() -> None:
@@ -75,6 +79,9 @@ def run() -> None:
 
     _config_path = args.config
     config = load_config(_config_path)
+    app.state.config = config
 
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
-    uvicorn.run(app, host=config.server.host, port=config.server.port)
+    # uvicorn[standard] already picks uvloop and httptools when available ("auto").
+    # Access logs are off: each request would otherwise format and write a line.
+    uvicorn.run(app, host=config.server.host, port=config.server.port, access_log=False)
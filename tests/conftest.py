@@ -1,5 +1,8 @@
 """Shared test fixtures."""
 
+from typing import Any
+
+import httpx
 import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
@@ -27,7 +30,7 @@ class MockBackend(Backend):
             total_act_ret_energy=6789.01,
         )
         return MeterData(
-            phases=[phase],
+            phases=(phase,),
             total_act_power=500.0,
             total_aprt_power=520.0,
             total_current=4.2,
@@ -47,20 +50,66 @@ class MockBackend(Backend):
     def set_data(self, data: MeterData) -> None:
         self._data = data
 
+    def reset(self) -> None:
+        self._data = self._default_data()
+
+
+class FakeAsyncClient:
+    """Minimal stand-in for httpx.AsyncClient that replays canned responses.
+
+    Responses are returned in order; the last one repeats once the rest are used.
+    """
+
+    def __init__(self, *responses: httpx.Response) -> None:
+        self.headers: dict[str, str] = {}
+        self.requests: list[str] = []
+        self.closed = False
+        self._responses = list(responses)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        self.requests.append(url)
+        if len(self._responses) > 1:
+            return self._responses.pop(0)
+        return self._responses[0]
+
+    async def aclose(self) -> None:
+        self.closed = True
+
 
 TEST_MAC = "AABBCCDDEEFF"
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def mock_backend():
     return MockBackend()
 
 
-@pytest.fixture
-def client(mock_backend):
-    """FastAPI test client with a Shelly frontend (no lifespan)."""
+@pytest.fixture(scope="module")
+def shelly_app(mock_backend):
+    """FastAPI app serving a Shelly frontend (no lifespan), shared by a test module."""
     frontend = ShellyFrontend(mock_backend, {"mac": TEST_MAC, "phases": 1, "mdns": False})
     test_app = FastAPI()
     test_app.include_router(frontend.get_router())
-    with TestClient(test_app) as c:
+    return test_app
+
+
+@pytest.fixture
+async def client(shelly_app, mock_backend):
+    """Async HTTP client calling the app in-process, backend data reset."""
+    mock_backend.reset()
+    transport = httpx.ASGITransport(app=shelly_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
         yield c
+
+
+@pytest.fixture(scope="module")
+def _ws_test_client(shelly_app):
+    with TestClient(shelly_app) as c:
+        yield c
+
+
+@pytest.fixture
+def ws_client(_ws_test_client, mock_backend):
+    """Starlette test client for WebSocket tests (httpx has no WebSocket support)."""
+    mock_backend.reset()
+    return _ws_test_client
@@ -4,7 +4,7 @@ import textwrap
 
 import pytest
 
-from meter_emulator.config import EnvoyConfig, load_config
+from meter_emulator.config import EnvoyConfig, _walk_and_substitute, load_config
 
 
 def test_load_full_config(tmp_path):
@@ -83,6 +83,20 @@ def test_env_var_substitution(tmp_path, monkeypatch):
     assert config.backend.envoy.token == "my-jwt-token-123"
 
 
+def test_env_var_substitution_copies_only_changed_subtrees(monkeypatch):
+    monkeypatch.setenv("TEST_ENVOY_TOKEN", "my-jwt-token-123")
+
+    server = {"host": "127.0.0.1", "port": 8080}
+    envoy = {"host": "10.0.0.1", "token": "${TEST_ENVOY_TOKEN}"}
+    raw = {"server": server, "backend": {"envoy": envoy}}
+
+    result = _walk_and_substitute(raw)
+    assert result["backend"]["envoy"]["token"] == "my-jwt-token-123"
+    assert result["server"] is server
+    # The input is left untouched
+    assert envoy["token"] == "${TEST_ENVOY_TOKEN}"
+
+
 def test_env_var_missing_raises(tmp_path):
     config_file = tmp_path / "config.yaml"
     config_file.write_text(
@@ -6,7 +6,9 @@ from unittest.mock import AsyncMock, patch
 import httpx
 import pytest
 
+from meter_emulator.backends.base import PhaseData
 from meter_emulator.backends.envoy import EnvoyBackend, parse_envoy_response
+from tests.conftest import FakeAsyncClient
 
 ENVOY_RESPONSE_SINGLE_PHASE = {
     "production": [
@@ -122,6 +124,11 @@ def test_parse_empty_response():
     data = parse_envoy_response({}, phases=1)
     assert data.total_act_power == 0.0
     assert len(data.phases) == 1
+    # Every empty response shares one snapshot, which can't be corrupted in place
+    assert parse_envoy_response({}, phases=3) is data
+    with pytest.raises(TypeError):
+        data.phases[0] = PhaseData(act_power=1.0)
+    assert not hasattr(data.phases, "append")
 
 
 ENVOY_RESPONSE_THREE_PHASE = {
@@ -241,7 +248,50 @@ def test_parse_three_phase():
 
     # Totals
     assert data.total_act_power == 1000.0
-    assert data.total_current == pytest.approx(1.3 + 2.2 + 0.9, abs=0.01)
+    # Phases are summed in order A, B, C, so the float result is deterministic
+    assert data.total_current == 1.3 + 2.2 + 0.9
+
+
+def test_parse_three_phase_missing_lines():
+    """Phases without a matching Envoy line are zero-filled."""
+    response = {
+        "consumption": [
+            {
+                "measurementType": "net-consumption",
+                "wNow": 300.0,
+                "lines": [{"wNow": 300.0, "rmsVoltage": 230.0, "whLifetime": 2000.0}],
+            },
+        ],
+    }
+
+    data = parse_envoy_response(response, phases=3)
+
+    assert len(data.phases) == 3
+    assert data.phases[0].act_power == 300.0
+    assert data.phases[0].total_act_ret_energy == 2000.0
+    assert data.phases[1].act_power == 0.0
+    assert data.phases[2].voltage == 0.0
+    assert data.total_act_power == 300.0
+
+
+def test_parse_matches_type_when_measurement_type_differs():
+    """A block is found by its "type" even if "measurementType" says otherwise."""
+    response = {
+        "consumption": [
+            {"measurementType": "foo", "type": "net-consumption", "wNow": 750.0},
+        ],
+    }
+
+    data = parse_envoy_response(response, phases=1)
+    assert data.total_act_power == 750.0
+
+
+def test_invalid_phase_count_rejected():
+    """Phase counts other than 1 or 3 raise a clear ValueError."""
+    with pytest.raises(ValueError, match="phases must be 1 or 3"):
+        parse_envoy_response(ENVOY_RESPONSE_THREE_PHASE, phases=2)
+    with pytest.raises(ValueError, match="phases must be 1 or 3"):
+        EnvoyBackend({"host": "192.168.1.1", "token": "jwt", "phases": 2})
 
 
 def test_parse_no_net_consumption_falls_back():
@@ -339,17 +389,16 @@ async def test_poll_refreshes_token_on_401():
     )
 
     # Mock the HTTP client: first call returns 401, second returns OK
-    mock_client = AsyncMock(spec=httpx.AsyncClient)
     resp_401 = httpx.Response(401, request=httpx.Request("GET", "https://x"))
     resp_ok = httpx.Response(
         200, json=VALID_PRODUCTION_JSON, request=httpx.Request("GET", "https://x")
     )
-    mock_client.get = AsyncMock(side_effect=[resp_401, resp_ok])
-    backend._client = mock_client
+    client = FakeAsyncClient(resp_401, resp_ok)
+    backend._client = client
 
     # Mock _refresh_token to update the token
     async def mock_refresh():
-        backend._token = "new-jwt"
+        backend._set_token("new-jwt")
 
     backend._refresh_token = AsyncMock(side_effect=mock_refresh)
 
@@ -358,9 +407,11 @@ async def test_poll_refreshes_token_on_401():
         with pytest.raises(asyncio.CancelledError):
             await backend._poll_loop()
 
-    # Token was refreshed
+    # Token was refreshed and the client now sends it
     backend._refresh_token.assert_called_once()
     assert backend._token == "new-jwt"
+    assert client.headers["Authorization"] == "Bearer new-jwt"
+    assert len(client.requests) == 2
     # Data was parsed from the retry response
     assert backend._data.total_act_power == 500.0
 
@@ -369,10 +420,8 @@ async def test_poll_no_refresh_on_401_without_credentials():
     """Without credentials, 401 is just logged as a poll failure."""
     backend = EnvoyBackend({"host": "192.168.1.1", "token": "static-jwt"})
 
-    mock_client = AsyncMock(spec=httpx.AsyncClient)
     resp_401 = httpx.Response(401, request=httpx.Request("GET", "https://x"))
-    mock_client.get = AsyncMock(return_value=resp_401)
-    backend._client = mock_client
+    backend._client = FakeAsyncClient(resp_401)
 
     with patch("asyncio.sleep", side_effect=asyncio.CancelledError):
         with pytest.raises(asyncio.CancelledError):
@@ -436,9 +485,83 @@ async def test_stop_closes_aiohttp_session():
 
     mock_session = AsyncMock()
     backend._aiohttp_session = mock_session
-    backend._client = AsyncMock(spec=httpx.AsyncClient)
+    client = FakeAsyncClient()
+    backend._client = client
 
     await backend.stop()
 
     mock_session.close.assert_awaited_once()
-    backend._client.aclose.assert_awaited_once()
+    assert client.closed
+
+
+async def test_poll_sleeps_until_next_deadline():
+    """Poll latency is subtracted from the sleep so the cadence stays fixed."""
+    backend = EnvoyBackend({"host": "192.168.1.1", "token": "jwt", "poll_interval": 2.0})
+
+    resp_ok = httpx.Response(
+        200, json=VALID_PRODUCTION_JSON, request=httpx.Request("GET", "https://x")
+    )
+    backend._client = FakeAsyncClient(resp_ok)
+
+    # Poll starts at t=100.0 and the request takes 0.5s
+    with (
+        patch("meter_emulator.backends.envoy._monotonic", side_effect=[100.0, 100.5]),
+        patch("asyncio.sleep", side_effect=asyncio.CancelledError) as mock_sleep,
+    ):
+        with pytest.raises(asyncio.CancelledError):
+            await backend._poll_loop()
+
+    mock_sleep.assert_called_once_with(pytest.approx(1.5))
+
+
+async def test_poll_skips_parse_when_body_unchanged():
+    """An identical response body reuses the previous snapshot without reparsing."""
+    backend = EnvoyBackend({"host": "192.168.1.1", "token": "jwt"})
+
+    resp_ok = httpx.Response(
+        200, json=VALID_PRODUCTION_JSON, request=httpx.Request("GET", "https://x")
+    )
+    client = FakeAsyncClient(resp_ok)
+    backend._client = client
+
+    # Run two poll iterations
+    with (
+        patch.object(backend, "_parse", wraps=backend._parse) as mock_parse,
+        patch("asyncio.sleep", side_effect=[None, asyncio.CancelledError]),
+    ):
+        with pytest.raises(asyncio.CancelledError):
+            await backend._poll_loop()
+
+    assert len(client.requests) == 2
+    mock_parse.assert_called_once()
+    assert backend._data.total_act_power == 500.0
+
+
+def test_token_check_scheduled_at_refresh_window():
+    """The token check sleeps until the token is 30 days from expiry, at most a week."""
+    backend = EnvoyBackend(
+        {
+            "host": "192.168.1.1",
+            "username": "user@example.com",
+            "password": "pass",
+            "serial": "123456",
+        }
+    )
+    day = 24 * 3600
+
+    # No token auth yet: retry daily
+    assert backend._next_token_check_delay() == day
+
+    backend._token_auth = AsyncMock()
+    with patch("meter_emulator.backends.envoy.time.time", return_value=1_000_000.0):
+        # Expires in 35 days: wake up in 5
+        backend._token_auth.expire_timestamp = 1_000_000.0 + 35 * day
+        assert backend._next_token_check_delay() == pytest.approx(5 * day)
+
+        # Expires in 100 days: capped, re-check against the wall clock in a week
+        backend._token_auth.expire_timestamp = 1_000_000.0 + 100 * day
+        assert backend._next_token_check_delay() == 7 * day
+
+        # Already inside the refresh window: don't spin, check again in a day
+        backend._token_auth.expire_timestamp = 1_000_000.0 + 10 * day
+        assert backend._next_token_check_delay() == day
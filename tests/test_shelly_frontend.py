@@ -1,11 +1,14 @@
 """Tests for Shelly frontend API endpoints."""
 
+from unittest.mock import patch
+
 from meter_emulator.backends.base import MeterData, PhaseData
+from meter_emulator.frontends import shelly
 from tests.conftest import TEST_MAC
 
 
-def test_shelly_info(client):
-    resp = client.get("/shelly")
+async def test_shelly_info(client):
+    resp = await client.get("/shelly")
     assert resp.status_code == 200
     data = resp.json()
     assert data["mac"] == TEST_MAC
@@ -16,16 +19,29 @@ def test_shelly_info(client):
     assert data["auth_en"] is False
 
 
-def test_get_device_info(client):
-    resp = client.get("/rpc/Shelly.GetDeviceInfo")
+async def test_get_device_info(client):
+    resp = await client.get("/rpc/Shelly.GetDeviceInfo")
     assert resp.status_code == 200
     data = resp.json()
     assert data["mac"] == TEST_MAC
     assert data["app"] == "Pro3EM"
 
 
-def test_em_get_status(client):
-    resp = client.get("/rpc/EM.GetStatus?id=0")
+def test_openapi_operation_ids(shelly_app):
+    """Route names, and so the OpenAPI operationIds, don't follow handler names."""
+    paths = shelly_app.openapi()["paths"]
+    assert {path: paths[path]["get"]["operationId"] for path in paths} == {
+        "/shelly": "shelly_info_shelly_get",
+        "/rpc/Shelly.GetDeviceInfo": "get_device_info_rpc_Shelly_GetDeviceInfo_get",
+        "/rpc/EM.GetStatus": "em_status_rpc_EM_GetStatus_get",
+        "/rpc/EMData.GetStatus": "emdata_status_rpc_EMData_GetStatus_get",
+        "/rpc/Shelly.GetStatus": "shelly_status_rpc_Shelly_GetStatus_get",
+    }
+    assert paths["/shelly"]["get"]["summary"] == "Shelly Info"
+
+
+async def test_em_get_status(client):
+    resp = await client.get("/rpc/EM.GetStatus?id=0")
     assert resp.status_code == 200
     data = resp.json()
     assert data["id"] == 0
@@ -43,8 +59,8 @@ def test_em_get_status(client):
     assert data["c_act_power"] == 0.0
 
 
-def test_emdata_get_status(client):
-    resp = client.get("/rpc/EMData.GetStatus?id=0")
+async def test_emdata_get_status(client):
+    resp = await client.get("/rpc/EMData.GetStatus?id=0")
     assert resp.status_code == 200
     data = resp.json()
     assert data["id"] == 0
@@ -57,8 +73,8 @@ def test_emdata_get_status(client):
     assert data["c_total_act_ret_energy"] == 0.0
 
 
-def test_shelly_get_status(client):
-    resp = client.get("/rpc/Shelly.GetStatus")
+async def test_shelly_get_status(client):
+    resp = await client.get("/rpc/Shelly.GetStatus")
     assert resp.status_code == 200
     data = resp.json()
     assert "sys" in data
@@ -69,7 +85,7 @@ def test_shelly_get_status(client):
     assert data["emdata:0"]["total_act"] == 12345.67
 
 
-def test_em_get_status_negative_power(client, mock_backend):
+async def test_em_get_status_negative_power(client, mock_backend):
     """Test that negative power (export) is correctly represented."""
     phase = PhaseData(
         voltage=230.0,
@@ -83,7 +99,7 @@ def test_em_get_status_negative_power(client, mock_backend):
     )
     mock_backend.set_data(
         MeterData(
-            phases=[phase],
+            phases=(phase,),
             total_act_power=-700.0,
             total_aprt_power=700.0,
             total_current=3.0,
@@ -92,15 +108,15 @@ def test_em_get_status_negative_power(client, mock_backend):
         )
     )
 
-    resp = client.get("/rpc/EM.GetStatus?id=0")
+    resp = await client.get("/rpc/EM.GetStatus?id=0")
     data = resp.json()
     assert data["a_act_power"] == -700.0
     assert data["total_act_power"] == -700.0
 
 
-def test_three_phase_data(client, mock_backend):
+async def test_three_phase_data(client, mock_backend):
     """Test 3-phase data is correctly mapped."""
-    phases = [
+    phases = (
         PhaseData(
             voltage=230.0,
             current=2.0,
@@ -131,7 +147,7 @@ def test_three_phase_data(client, mock_backend):
             total_act_energy=3000.0,
             total_act_ret_energy=1500.0,
         ),
-    ]
+    )
     mock_backend.set_data(
         MeterData(
             phases=phases,
@@ -143,7 +159,7 @@ def test_three_phase_data(client, mock_backend):
         )
     )
 
-    resp = client.get("/rpc/EM.GetStatus?id=0")
+    resp = await client.get("/rpc/EM.GetStatus?id=0")
     data = resp.json()
     assert data["a_act_power"] == 400.0
     assert data["b_act_power"] == 600.0
@@ -151,12 +167,28 @@ def test_three_phase_data(client, mock_backend):
     assert data["total_act_power"] == 1200.0
 
 
+async def test_status_built_once_per_snapshot(client, mock_backend):
+    """EM/EMData payloads are reused until the backend publishes a new snapshot."""
+    with patch.object(shelly, "em_get_status", wraps=shelly.em_get_status) as mock_em:
+        await client.get("/rpc/EM.GetStatus")
+        await client.get("/rpc/EMData.GetStatus")
+        await client.get("/rpc/Shelly.GetStatus")
+        assert mock_em.call_count == 1
+
+        mock_backend.set_data(
+            MeterData(phases=(PhaseData(act_power=-50.0),), total_act_power=-50.0)
+        )
+        resp = await client.get("/rpc/EM.GetStatus")
+        assert mock_em.call_count == 2
+        assert resp.json()["total_act_power"] == -50.0
+
+
 # ── WebSocket /rpc tests ──────────────────────────────────────────────
 
 
-def test_ws_rpc_em_get_status(client):
+def test_ws_rpc_em_get_status(ws_client):
     """WebSocket RPC returns EM.GetStatus data."""
-    with client.websocket_connect("/rpc") as ws:
+    with ws_client.websocket_connect("/rpc") as ws:
         ws.send_json({"id": 1, "src": "test", "method": "EM.GetStatus", "params": {"id": 0}})
         resp = ws.receive_json()
         assert resp["id"] == 1
@@ -166,9 +198,9 @@ def test_ws_rpc_em_get_status(client):
         assert resp["result"]["a_voltage"] == 230.5
 
 
-def test_ws_rpc_shelly_get_status(client):
+def test_ws_rpc_shelly_get_status(ws_client):
     """WebSocket RPC returns Shelly.GetStatus data."""
-    with client.websocket_connect("/rpc") as ws:
+    with ws_client.websocket_connect("/rpc") as ws:
         ws.send_json({"id": 2, "src": "battery", "method": "Shelly.GetStatus"})
         resp = ws.receive_json()
         assert resp["id"] == 2
@@ -178,18 +210,42 @@ def test_ws_rpc_shelly_get_status(client):
         assert resp["result"]["sys"]["mac"] == TEST_MAC
 
 
-def test_ws_rpc_device_info(client):
+def test_ws_rpc_device_info(ws_client):
     """WebSocket RPC returns Shelly.GetDeviceInfo."""
-    with client.websocket_connect("/rpc") as ws:
+    with ws_client.websocket_connect("/rpc") as ws:
         ws.send_json({"id": 3, "src": "app", "method": "Shelly.GetDeviceInfo"})
         resp = ws.receive_json()
         assert resp["result"]["mac"] == TEST_MAC
         assert resp["result"]["app"] == "Pro3EM"
 
 
-def test_ws_rpc_unknown_method(client):
+def test_ws_rpc_static_results(ws_client):
+    """Pre-serialized GetConfig/GetComponents results are embedded in the envelope."""
+    with ws_client.websocket_connect("/rpc") as ws:
+        ws.send_json({"id": 6, "src": "app", "method": "Shelly.GetConfig"})
+        config = ws.receive_json()
+        ws.send_json({"id": 7, "src": "app", "method": "Shelly.GetComponents"})
+        components = ws.receive_json()
+
+    assert config["id"] == 6
+    assert config["result"]["em:0"]["ct_type"] == "120A"
+    assert components["id"] == 7
+    assert components["result"] == {"components": [], "cfg_rev": 0, "offset": 0, "total": 0}
+
+
+def test_ws_rpc_binary_frame(ws_client):
+    """WebSocket RPC also accepts requests sent as binary frames."""
+    with ws_client.websocket_connect("/rpc") as ws:
+        ws.send_bytes(b'{"id": 5, "src": "bin", "method": "EM.GetStatus"}')
+        resp = ws.receive_json()
+        assert resp["id"] == 5
+        assert resp["dst"] == "bin"
+        assert resp["result"]["total_act_power"] == 500.0
+
+
+def test_ws_rpc_unknown_method(ws_client):
     """WebSocket RPC returns error for unknown methods."""
-    with client.websocket_connect("/rpc") as ws:
+    with ws_client.websocket_connect("/rpc") as ws:
         ws.send_json({"id": 4, "src": "test", "method": "Unknown.Method"})
         resp = ws.receive_json()
         assert resp["id"] == 4
@@ -198,9 +254,9 @@ def test_ws_rpc_unknown_method(client):
         assert "Method not found" in resp["error"]["message"]
 
 
-def test_ws_rpc_multiple_requests(client):
+def test_ws_rpc_multiple_requests(ws_client):
     """WebSocket RPC handles multiple sequential requests on one connection."""
-    with client.websocket_connect("/rpc") as ws:
+    with ws_client.websocket_connect("/rpc") as ws:
         ws.send_json({"id": 1, "src": "t", "method": "EM.GetStatus"})
         r1 = ws.receive_json()
         ws.send_json({"id": 2, "src": "t", "method": "EMData.GetStatus"})
@@ -210,3 +266,14 @@ def test_ws_rpc_multiple_requests(client):
         assert r1["result"]["total_act_power"] == 500.0
         assert r2["id"] == 2
         assert r2["result"]["total_act"] == 12345.67
+
+
+def test_ws_rpc_pipelined_requests(ws_client):
+    """Requests sent back to back without awaiting replies are all answered."""
+    with ws_client.websocket_connect("/rpc") as ws:
+        ws.send_json({"id": 1, "src": "t", "method": "EM.GetStatus"})
+        ws.send_json({"id": 2, "src": "t", "method": "EMData.GetStatus"})
+        replies = {r["id"]: r for r in (ws.receive_json(), ws.receive_json())}
+
+        assert replies[1]["result"]["total_act_power"] == 500.0
+        assert replies[2]["result"]["total_act"] == 12345.67
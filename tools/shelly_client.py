@@ -18,24 +18,37 @@ import argparse
 import asyncio
 import json
 import logging
+from collections.abc import AsyncIterator, Callable
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime
 
 import aiohttp
 from aioshelly.common import ConnectionOptions
 from aioshelly.rpc_device import RpcDevice, RpcUpdateType
 
+try:
+    # uvloop comes with uvicorn[standard] on POSIX; it handles follow-mode frames faster
+    from uvloop import run as run_event_loop
+except ImportError:
+    from asyncio import run as run_event_loop
+
+# (label, power key, voltage key, current key) for each phase in EM status
+_EM_KEYS = tuple(
+    (phase.upper(), f"{phase}_act_power", f"{phase}_voltage", f"{phase}_current") for phase in "abc"
+)
+
 
 def print_em_status(status: dict) -> None:
     """Print EM and EMData status from a device status dict."""
     if "em:0" in status:
         em = status["em:0"]
         parts = []
-        for phase in ("a", "b", "c"):
-            power = em.get(f"{phase}_act_power", 0.0)
-            voltage = em.get(f"{phase}_voltage", 0.0)
-            current = em.get(f"{phase}_current", 0.0)
+        for label, power_key, voltage_key, current_key in _EM_KEYS:
+            power = em.get(power_key, 0.0)
+            voltage = em.get(voltage_key, 0.0)
+            current = em.get(current_key, 0.0)
             if voltage > 0 or power != 0:
-                parts.append(f"{phase.upper()}:{power:>7.1f}W {voltage:.0f}V {current:.2f}A")
+                parts.append(f"{label}:{power:>7.1f}W {voltage:.0f}V {current:.2f}A")
         total = em.get("total_act_power", 0.0)
         parts.append(f"Total:{total:>7.1f}W")
         print(f"  EM  | {' | '.join(parts)}")
@@ -59,23 +72,45 @@ def setup_verbose_logging() -> None:
         log.addHandler(handler)
 
 
+@asynccontextmanager
+async def shelly_device(
+    host: str,
+    port: int,
+    session: aiohttp.ClientSession | None = None,
+    on_update: Callable[[RpcDevice, RpcUpdateType], None] | None = None,
+) -> AsyncIterator[RpcDevice]:
+    """Connect to a Shelly device and yield the initialized RpcDevice.
+
+    Pass a session to reuse its connection pool across several devices or runs;
+    without one, a session is created for the lifetime of the device. on_update
+    is subscribed before initialization so no push update is missed.
+    """
+    async with AsyncExitStack() as stack:
+        if session is None:
+            session = await stack.enter_async_context(aiohttp.ClientSession())
+        device = RpcDevice(None, session, ConnectionOptions(host, port=port))
+        if on_update is not None:
+            device.subscribe_updates(on_update)
+        await device.initialize()
+        stack.push_async_callback(device.shutdown)
+        yield device
+
+
 async def main(host: str, port: int, follow: bool, verbose: bool) -> None:
     if verbose:
         setup_verbose_logging()
 
     print(f"Connecting to {host}:{port}...")
-    options = ConnectionOptions(host, port=port)
-
-    async with aiohttp.ClientSession() as session:
-        update_event = asyncio.Event()
 
-        def on_update(device: RpcDevice, update_type: RpcUpdateType) -> None:
-            update_event.set()
+    # Bounded so a stalled terminal can't grow it: the oldest update is dropped
+    updates: asyncio.Queue[RpcUpdateType] = asyncio.Queue(maxsize=16)
 
-        device = RpcDevice(None, session, options)
-        device.subscribe_updates(on_update)
-        await device.initialize()
+    def on_update(device: RpcDevice, update_type: RpcUpdateType) -> None:
+        if updates.full():
+            updates.get_nowait()
+        updates.put_nowait(update_type)
 
+    async with shelly_device(host, port, on_update=on_update) as device:
         info = device.shelly
         print()
         print("=== Device Info ===")
@@ -95,7 +130,6 @@ async def main(host: str, port: int, follow: bool, verbose: bool) -> None:
         print_em_status(device.status)
 
         if not follow:
-            await device.shutdown()
             print()
             print("OK — emulator responds correctly to aioshelly RpcDevice")
             return
@@ -104,8 +138,10 @@ async def main(host: str, port: int, follow: bool, verbose: bool) -> None:
         print("=== Following updates (Ctrl+C to stop) ===", flush=True)
         try:
             while True:
-                update_event.clear()
-                await update_event.wait()
+                await updates.get()
+                # device.status already reflects the latest update: print a burst once
+                while not updates.empty():
+                    updates.get_nowait()
                 ts = datetime.now().strftime("%H:%M:%S")
                 if verbose:
                     print(f"[{ts}] Raw status:")
@@ -115,9 +151,7 @@ async def main(host: str, port: int, follow: bool, verbose: bool) -> None:
                     print_em_status(device.status)
         except (KeyboardInterrupt, asyncio.CancelledError):
             pass
-        finally:
-            await device.shutdown()
-            print("\nDisconnected.")
+    print("\nDisconnected.")
 
 
 if __name__ == "__main__":
@@ -129,4 +163,4 @@ if __name__ == "__main__":
     )
     parser.add_argument("-v", "--verbose", action="store_true", help="Show raw WebSocket frames")
     args = parser.parse_args()
-    asyncio.run(main(args.host, args.port, args.follow, args.verbose))
+    run_event_loop(main(args.host, args.port, args.follow, args.verbose))